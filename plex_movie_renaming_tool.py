@@ -1,5 +1,14 @@
 #!/usr/bin/python
-import imdb, os, difflib, re
+import imdb, os, difflib, re, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+#number of IMDb searches to run at the same time
+MAX_SEARCH_WORKERS = 8
+
+#how many times to try a search before giving up, IMDb may refuse requests when too many come in at once
+SEARCH_ATTEMPTS = 3
+
+_thread_data = threading.local()
 
 def find_searchable_name(file):
     #remove extension
@@ -15,6 +24,49 @@ def find_searchable_name(file):
     
     return file.strip()
 
+def search_imdb(possible_movie_title):
+    #each search thread gets its own IMDb connection
+    if not hasattr(_thread_data, 'ia'):
+        _thread_data.ia = imdb.IMDb()
+    
+    for attempt in range(SEARCH_ATTEMPTS):
+        try:
+            return _thread_data.ia.search_movie(possible_movie_title)
+        except imdb.IMDbError as e:
+            print("Exception thrown: {}".format(e))
+            if attempt < SEARCH_ATTEMPTS - 1:
+                #back off a little longer each time before trying again
+                time.sleep(2 ** attempt)
+    
+    print("Issue searching IMDb for {}.".format(possible_movie_title))
+    return []
+
+def find_most_similar_movie(possible_movie_title, movies):
+    most_similar = None
+    highest_similarity = 0
+    seen_ids = set()
+    for movie in movies:
+        #IMDb can return the same movie more than once, no need to compare it again
+        if movie.movieID in seen_ids:
+            continue
+        seen_ids.add(movie.movieID)
+        
+        #only "movie" and "TV movie" results can be accepted, so don't bother comparing anything else
+        if 'movie' not in movie['kind']:
+            continue
+        
+        similarity = difflib.SequenceMatcher(None, possible_movie_title, movie['title'].lower()).ratio()
+        if similarity == 1.0:
+            most_similar = movie
+            highest_similarity = 1.0
+            #100% match, no need to check any more
+            break
+        elif similarity > highest_similarity:
+            most_similar = movie
+            highest_similarity = similarity
+    
+    return most_similar, highest_similarity
+
 def change_filename(path, original_file, movie):
     try:
         movie_title = movie['title']
@@ -46,36 +98,45 @@ def change_filename(path, original_file, movie):
 # If movie name cannot be accurately determined by existing search_text, file is not changed
 def rename_files():
     folder = os.getcwd()
-
-    ia = imdb.IMDb()
-        
-    for file in os.listdir(folder):
-        if '{imdb-' in file:
-            continue
-        print("Analyzing file: {}".format(file))
-        possible_movie_title = find_searchable_name(file)
-        movies = ia.search_movie(possible_movie_title)
-        
-        #check for the most similar movie returned
-        highest_similarity = 0
-        for movie in movies:
-            similarity = difflib.SequenceMatcher(None, possible_movie_title, movie['title'].lower()).ratio()
-            if similarity == 1.0:
-                if 'movie' in movie['kind']:
-                    most_similar = movie
-                    highest_similarity = 1.0
-                    #100% match, no need to check any more
-                    break
-            elif similarity > highest_similarity:
-                if 'movie' in movie['kind']:
-                    most_similar = movie
-                    highest_similarity = similarity
+    
+    #skip anything already converted, folders, and this script before doing any searching
+    this_script = os.path.basename(__file__)
+    with os.scandir(folder) as entries:
+        files = [entry.name for entry in entries
+                 if '{imdb-' not in entry.name
+                 and entry.name != this_script
+                 and entry.is_file()]
+    
+    #group files by searchable name so rips of the same movie only search IMDb once
+    files_by_title = {}
+    for file in files:
+        files_by_title.setdefault(find_searchable_name(file), []).append(file)
+    
+    #IMDb searches are mostly spent waiting on the network, so run several at once
+    #and rename each file as its search comes back
+    with ThreadPoolExecutor(max_workers=MAX_SEARCH_WORKERS) as executor:
+        searches = {executor.submit(search_imdb, title): title for title in files_by_title}
         
-        #now that we have the most similar from the search results, check the similarity value to see if we should accept it
-        if highest_similarity >= 0.9:
-            change_filename(folder, file, most_similar)
-        else:
-            print("Couldn't find proper match within IMDb. Skipping... ")
+        try:
+            for search in as_completed(searches):
+                possible_movie_title = searches[search]
+                
+                #check for the most similar movie returned
+                most_similar, highest_similarity = find_most_similar_movie(possible_movie_title, search.result())
+                
+                for file in files_by_title[possible_movie_title]:
+                    print("Analyzing file: {}".format(file))
+                    
+                    #now that we have the most similar from the search results, check the similarity value to see if we should accept it
+                    if highest_similarity >= 0.9:
+                        change_filename(folder, file, most_similar)
+                    else:
+                        print("Couldn't find proper match within IMDb. Skipping... ")
+        except BaseException:
+            #on Ctrl-C (or any error) drop the searches still waiting so we don't sit through them before exiting
+            for search in searches:
+                search.cancel()
+            raise
         
     print("Finished renaming files.")
 